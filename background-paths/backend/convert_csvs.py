@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Conversion des fichiers CSV en Parquet (et des données de marché en tableaux
+NumPy partagés entre les workers) pour accélérer le chargement du backend
+"""
+import os
+import pandas as pd
+from main import MARKET_COLUMNS, market_arrays_dir, read_table, save_market_arrays
+
+DATA_PREFIXES = ("imf_indicators", "wb_indicators", "market_data_", "corp_info_")
+
+if __name__ == "__main__":
+    # Change to the root directory to access CSV files
+    os.chdir("..")
+    
+    for csv_path in sorted(os.listdir('.')):
+        if not (csv_path.startswith(DATA_PREFIXES) and csv_path.endswith('.csv')):
+            continue
+        
+        # Parse once with the same defaults as the API, then store columnar
+        df = pd.read_csv(csv_path)
+        parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+        df.to_parquet(parquet_path, index=False)
+        print(f"Converted {csv_path} -> {parquet_path}: {len(df)} records")
+        
+        # Market history is also stored as memory-mappable column arrays
+        if csv_path.startswith("market_data_"):
+            arrays_dir = market_arrays_dir(csv_path)
+            save_market_arrays(read_table(csv_path, MARKET_COLUMNS), arrays_dir)
+            print(f"Converted {csv_path} -> {arrays_dir}")
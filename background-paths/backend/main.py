@@ -1,14 +1,22 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import pandas as pd
 import numpy as np
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel
+from dataclasses import dataclass, fields
+import asyncio
 import os
 from datetime import datetime
+from functools import lru_cache
+from bisect import bisect_left
 import json
+import orjson
 
-app = FastAPI(title="Financial Data API", version="1.0.0")
+# Endpoints return plain dicts, serialized with orjson. ORJSONResponse is deprecated in recent
+# FastAPI releases (0.143 emits a FastAPIDeprecationWarning on every request path)
+app = FastAPI(title="Financial Data API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -64,36 +72,383 @@ class ChartData(BaseModel):
     volume: float
 
 # Global data storage
-imf_data = None
-wb_data = None
-market_data = None
 company_info = None
 
+@dataclass(slots=True)
+class ChartArrays:
+    """One ticker's market history as contiguous column arrays, sorted by timestamp"""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    change: Optional[np.ndarray] = None
+    market_cap: Optional[np.ndarray] = None
+
+# Market history per ticker
+market_by_ticker: Dict[str, ChartArrays] = {}
+
+# Distinct market tickers sorted case-insensitively, with their lowercased forms for bisection
+market_tickers = []
+market_tickers_lc = []
+
+# Number of trailing rows served for each chart period (other periods get the full history)
+CHART_PERIODS = {"1W": 7, "1M": 30, "3M": 90, "1Y": 365}
+
+# Columns used by the API for each data source
+IMF_COLUMNS = ['id', 'indicator_name_fr', 'description', 'country', 'value', 'year', 'last_updated']
+WB_COLUMNS = ['id', 'indicator_name_fr', 'indicator_name', 'country_name', 'value', 'year', 'last_updated', 'unit']
+MARKET_COLUMNS = ['ticker', 'timestamp', 'open_price', 'high_price', 'low_price', 'close_price', 'volume', 'rendement', 'market_cap']
+COMPANY_COLUMNS = ['ticker', 'company_name', 'long_business_summary', 'website', 'industry', 'sector', 'country', 'city', 'full_time_employees']
+
+# Low-cardinality text columns stored as categories (prices stay float64, as they are served)
+CATEGORY_COLUMNS = ['ticker', 'country', 'country_name', 'sector', 'industry']
+
+# (source, row position) of each indicator id, IMF entries taking precedence
+indicator_by_id = {}
+
+# Indicator column arrays by response field, indexed by row position
+imf_fields = None
+wb_fields = None
+
+# /api/companies records built at load time, with pre-serialized payloads for common limits
+COMPANY_PAYLOAD_LIMITS = (10, 25, 50, 100)
+company_records = []
+company_payloads = {}
+company_record_by_ticker = {}
+ticker_to_name = {}
+
+# Separates the fields of a row in its search haystack; queries containing it cannot match
+FIELD_SEPARATOR = '\x00'
+
+@dataclass(slots=True, eq=False)
+class SearchIndex:
+    """Per-row haystacks of a table's lowercased search fields, optionally with a 3-gram Bloom word per row"""
+    haystacks: np.ndarray
+    bloom: Optional[np.ndarray] = None
+
+# Search indexes, built once at load time
+imf_search = None
+wb_search = None
+company_search = None
+
+def lowercase_column(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Lowercased text column as an object array, missing values as empty strings"""
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Lowercase each category once and expand through the codes; missing values (code -1) take the trailing ''
+        categories = values.cat.categories.astype(str).str.lower().to_numpy(dtype=object)
+        return np.append(categories, '')[values.cat.codes.to_numpy()]
+    return values.fillna('').astype(str).str.lower().to_numpy(dtype=object)
+
+def text_column(df: pd.DataFrame, column: Optional[str]) -> np.ndarray:
+    """Text column as an object array, missing values (or a missing column) as empty strings"""
+    if column is None or column not in df:
+        return np.full(len(df), '', dtype=object)
+    return df[column].astype(object).fillna('').to_numpy()
+
+def indicator_fields(df: pd.DataFrame, description: str, country: str, unit: Optional[str] = None) -> Dict[str, Any]:
+    """Raw column arrays of an indicator table by EconomicIndicator field, None where the table lacks the column"""
+    columns = {
+        "id": 'id',
+        "title": 'indicator_name_fr',
+        "description": description,
+        "country": country,
+        "value": 'value',
+        "lastUpdate": 'last_updated',
+        "year": 'year',
+        "unit": unit
+    }
+    # The arrays share the table's buffers; values are only formatted for the rows a query returns
+    return {field: df[column].array if column in df else None for field, column in columns.items()}
+
+def native(value: Any) -> Any:
+    """Plain Python scalar for a NumPy scalar, other values unchanged"""
+    return value.item() if isinstance(value, np.generic) else value
+
+def field_value(values: Any, i: int, default: str) -> Any:
+    """Value at row i as stored (missing values serialize as null), `default` for a missing column"""
+    return default if values is None else native(values[i])
+
+def field_text(values: Any, i: int, default: str = '') -> Any:
+    """Value at row i, with missing values (or a missing column) as `default`"""
+    if values is None or pd.isna(values[i]):
+        return default
+    return native(values[i])
+
+def field_str(values: Any, i: int, default: str) -> str:
+    """Value at row i formatted as a string, `default` for a missing column"""
+    return default if values is None else str(native(values[i]))
+
+def indicator_positions(df: pd.DataFrame, source: str) -> Dict[int, Tuple[str, int]]:
+    """(source, row position) of each integer id in an indicator table, first row of an id winning"""
+    ids = pd.to_numeric(df['id'], errors='coerce').to_numpy()
+    if ids.dtype.kind == 'f':
+        # Missing or fractional ids can never equal an /api/economic lookup
+        positions = np.flatnonzero(np.isfinite(ids) & (ids == np.round(ids)))
+    else:
+        positions = np.arange(len(ids))
+    keys = ids[positions].astype(np.int64).tolist()
+    # Reversed so the first row of a duplicated id wins
+    return {key: (source, i) for key, i in zip(keys[::-1], positions[::-1].tolist())}
+
+def indicator_detail(columns: Dict[str, Any], i: int, source: str) -> Dict[str, Any]:
+    """/api/economic response for row i of an indicator table"""
+    return {
+        "id": field_str(columns["id"], i, ''),
+        "title": field_value(columns["title"], i, ''),
+        "description": field_value(columns["description"], i, ''),
+        "source": source,
+        "value": field_value(columns["value"], i, 'N/A'),
+        "country": field_value(columns["country"], i, ''),
+        "year": field_value(columns["year"], i, ''),
+        "lastUpdate": field_value(columns["lastUpdate"], i, '')
+    }
+
+def indicator_records(columns: Dict[str, Any], positions: np.ndarray, source: str, category: List[str]) -> List[Dict[str, Any]]:
+    """EconomicIndicator entries for the given rows of an indicator table"""
+    return [
+        {
+            "id": field_str(columns["id"], i, ''),
+            "title": field_text(columns["title"], i),
+            "description": field_text(columns["description"], i),
+            "source": source,
+            "category": category,
+            "country": field_text(columns["country"], i),
+            "value": field_str(columns["value"], i, 'N/A'),
+            "lastUpdate": field_text(columns["lastUpdate"], i),
+            "frequency": "Annual",
+            "year": field_str(columns["year"], i, ''),
+            "unit": field_text(columns["unit"], i)
+        }
+        for i in positions
+    ]
+
+def trigram_mask(text: str) -> int:
+    """64-bit Bloom word with one bit set per 3-gram of text"""
+    mask = 0
+    for i in range(len(text) - 2):
+        mask |= 1 << (hash(text[i:i + 3]) & 63)
+    return mask
+
+def build_search_index(df: pd.DataFrame, columns: List[str], bloom: bool = False) -> SearchIndex:
+    """Join the lowercased search fields of each row, fingerprinting their 3-grams if `bloom` is set"""
+    lowered = [lowercase_column(df, column) for column in columns]
+    haystacks = np.array([FIELD_SEPARATOR.join(values) for values in zip(*lowered)], dtype=object)
+    if not bloom:
+        return SearchIndex(haystacks=haystacks)
+    # Cross-field 3-grams only add bits, so the word never rules out a real match
+    words = np.fromiter((trigram_mask(haystack) for haystack in haystacks), dtype=np.uint64, count=len(df))
+    return SearchIndex(haystacks=haystacks, bloom=words)
+
+def find_rows(index: SearchIndex, q: str, limit: int) -> np.ndarray:
+    """Positions of the first `limit` rows where any search field contains q (case-insensitive)"""
+    return match_rows(index, q.lower(), limit)
+
+@lru_cache(maxsize=4096)
+def match_rows(index: SearchIndex, ql: str, limit: int) -> np.ndarray:
+    """find_rows for a lowercased query, memoised since the indexes do not change between loads"""
+    if FIELD_SEPARATOR in ql:
+        return np.array([], dtype=np.intp)
+    
+    # A row can only contain q if its Bloom word has every bit of q's 3-grams
+    qmask = trigram_mask(ql) if index.bloom is not None else 0
+    if qmask:
+        candidates = np.flatnonzero((index.bloom & np.uint64(qmask)) == np.uint64(qmask))
+    else:
+        candidates = range(len(index.haystacks))
+    
+    # One substring search per candidate covers all of its fields, stopping once `limit` rows matched
+    haystacks = index.haystacks
+    hits = []
+    for i in candidates:
+        if ql in haystacks[i]:
+            hits.append(i)
+            if len(hits) == limit:
+                break
+    
+    matches = np.array(hits, dtype=np.intp)
+    matches.setflags(write=False)
+    return matches
+
+def is_up_to_date(derived_path: str, csv_path: str) -> bool:
+    """Whether a file converted from a CSV exists and is not older than it"""
+    return os.path.exists(derived_path) and os.path.getmtime(derived_path) >= os.path.getmtime(csv_path)
+
+def read_table(csv_path: str, columns: List[str]) -> pd.DataFrame:
+    """Read the used columns of a CSV file, preferring an up-to-date Parquet copy (see convert_csvs.py)"""
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    if is_up_to_date(parquet_path, csv_path):
+        import pyarrow.parquet as pq
+        available = pq.read_schema(parquet_path).names
+        table = pq.read_table(parquet_path, columns=[c for c in columns if c in available], memory_map=True)
+        df = table.to_pandas()
+    else:
+        df = pd.read_csv(csv_path, usecols=lambda column: column in columns)
+    return shrink_dtypes(df)
+
+def shrink_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store low-cardinality text as categories"""
+    for column in df.columns.intersection(CATEGORY_COLUMNS):
+        df[column] = df[column].astype('category')
+    return df
+
+def build_chart_arrays(group: pd.DataFrame) -> ChartArrays:
+    """Split one ticker's history into contiguous per-column arrays, sorted by timestamp"""
+    group = group.sort_values('timestamp')
+    
+    def column(name: str, dtype=None) -> Optional[np.ndarray]:
+        return np.ascontiguousarray(group[name].to_numpy(dtype)) if name in group else None
+    
+    return ChartArrays(
+        timestamp=column('timestamp'),
+        open=column('open_price'),
+        high=column('high_price'),
+        low=column('low_price'),
+        close=column('close_price'),
+        volume=column('volume', np.float64),
+        change=column('rendement'),
+        market_cap=column('market_cap')
+    )
+
+def group_chart_arrays(market: pd.DataFrame) -> Dict[str, ChartArrays]:
+    """Per-ticker ChartArrays of a market data table"""
+    return {
+        ticker: build_chart_arrays(group)
+        for ticker, group in market.groupby('ticker', sort=False, observed=True)
+    }
+
+def market_arrays_dir(csv_path: str) -> str:
+    """Directory holding the .npy columns converted from a market data CSV"""
+    return os.path.splitext(csv_path)[0] + "_arrays"
+
+def save_market_arrays(market: pd.DataFrame, directory: str):
+    """Write market history as .npy columns, one contiguous block per ticker"""
+    by_ticker = group_chart_arrays(market)
+    os.makedirs(directory, exist_ok=True)
+    for field in fields(ChartArrays):
+        parts = [getattr(arrays, field.name) for arrays in by_ticker.values()]
+        if parts and parts[0] is not None:
+            values = np.concatenate(parts)
+            if values.dtype == object:
+                # Strings are stored fixed-width so the file can be memory-mapped
+                values = values.astype(str)
+            np.save(os.path.join(directory, f"{field.name}.npy"), values)
+    
+    np.save(os.path.join(directory, "tickers.npy"), np.array(list(by_ticker), dtype=str))
+    
+    # Written last, so its timestamp marks a complete conversion
+    offsets = np.cumsum([0] + [len(arrays.timestamp) for arrays in by_ticker.values()])
+    np.save(os.path.join(directory, "offsets.npy"), offsets)
+
+def load_market_arrays(directory: str) -> Dict[str, ChartArrays]:
+    """Memory-map the columns written by save_market_arrays, so every worker shares one copy"""
+    tickers = np.load(os.path.join(directory, "tickers.npy"))
+    offsets = np.load(os.path.join(directory, "offsets.npy"))
+    columns = {}
+    for field in fields(ChartArrays):
+        path = os.path.join(directory, f"{field.name}.npy")
+        if os.path.exists(path):
+            columns[field.name] = np.load(path, mmap_mode='r')
+    
+    return {
+        str(ticker): ChartArrays(**{name: values[start:end] for name, values in columns.items()})
+        for ticker, start, end in zip(tickers, offsets[:-1], offsets[1:])
+    }
+
+def build_company_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Company list and detail entries in the CompanyInfo shape, missing values as None"""
+    def object_column(column: str) -> np.ndarray:
+        if column not in df:
+            return np.full(len(df), '', dtype=object)
+        values = df[column].to_numpy(dtype=object)
+        values[pd.isna(values)] = None
+        return values
+    
+    text_fields = ['ticker', 'company_name', 'long_business_summary', 'website', 'industry', 'sector', 'country', 'city']
+    columns = [object_column(column) for column in text_fields]
+    
+    # Null checks are done once per column, the employee count also being converted to int
+    if 'full_time_employees' in df:
+        employees = df['full_time_employees'].to_numpy(dtype=float)
+    else:
+        employees = np.full(len(df), np.nan)
+    employees_ok = ~np.isnan(employees)
+    employees_int = np.where(employees_ok, np.nan_to_num(employees), -1).astype(np.int64)
+    
+    records = []
+    for i, values in enumerate(zip(*columns)):
+        record = dict(zip(text_fields, values))
+        record["employees"] = int(employees_int[i]) if employees_ok[i] else None
+        records.append(record)
+    return records
+
 def load_csv_data():
     """Load all CSV data on startup"""
-    global imf_data, wb_data, market_data, company_info
+    global company_info
+    global imf_search, wb_search, company_search, market_by_ticker, indicator_by_id, imf_fields, wb_fields
+    global market_tickers, market_tickers_lc, company_records, company_payloads, company_record_by_ticker
+    global ticker_to_name
+    
+    # Cached payloads and search hits were built from the previous data
+    chart_payload.cache_clear()
+    match_rows.cache_clear()
     
     try:
+        indicator_by_id = {}
+        
         # Load IMF indicators
         if os.path.exists("imf_indicators.csv"):
-            imf_data = pd.read_csv("imf_indicators.csv")
+            imf_data = read_table("imf_indicators.csv", IMF_COLUMNS)
+            imf_search = build_search_index(imf_data, ['indicator_name_fr', 'country'])
+            indicator_by_id = indicator_positions(imf_data, "IMF")
+            imf_fields = indicator_fields(imf_data, description='description', country='country')
             print(f"Loaded IMF data: {len(imf_data)} records")
         
         # Load World Bank indicators
         if os.path.exists("wb_indicators.csv"):
-            wb_data = pd.read_csv("wb_indicators.csv")
+            wb_data = read_table("wb_indicators.csv", WB_COLUMNS)
+            wb_search = build_search_index(wb_data, ['indicator_name_fr', 'country_name'])
+            # IMF entries take precedence over World Bank ones with the same id
+            indicator_by_id = {
+                **indicator_positions(wb_data, "World Bank"),
+                **indicator_by_id
+            }
+            wb_fields = indicator_fields(wb_data, description='indicator_name', country='country_name', unit='unit')
             print(f"Loaded World Bank data: {len(wb_data)} records")
         
         # Load market data
         market_files = [f for f in os.listdir('.') if f.startswith('market_data_') and f.endswith('.csv')]
         if market_files:
-            market_data = pd.read_csv(market_files[0])
-            print(f"Loaded market data: {len(market_data)} records")
+            arrays_dir = market_arrays_dir(market_files[0])
+            if is_up_to_date(os.path.join(arrays_dir, "offsets.npy"), market_files[0]):
+                # Converted by convert_csvs.py: attach to the arrays instead of parsing
+                market_by_ticker = load_market_arrays(arrays_dir)
+                records = sum(len(arrays.timestamp) for arrays in market_by_ticker.values())
+            else:
+                market_data = read_table(market_files[0], MARKET_COLUMNS)
+                market_by_ticker = group_chart_arrays(market_data)
+                records = len(market_data)
+            market_tickers = sorted(market_by_ticker, key=str.lower)
+            market_tickers_lc = [ticker.lower() for ticker in market_tickers]
+            print(f"Loaded market data: {records} records")
         
         # Load company info
         info_files = [f for f in os.listdir('.') if f.startswith('corp_info_') and f.endswith('.csv')]
         if info_files:
-            company_info = pd.read_csv(info_files[0])
+            company_info = read_table(info_files[0], COMPANY_COLUMNS)
+            # Names and tickers are short enough for a 64-bit Bloom word to rule out most rows;
+            # indicator titles set about half its bits, so those indexes are scanned directly
+            company_search = build_search_index(company_info, ['company_name', 'ticker'], bloom=True)
+            company_records = build_company_records(company_info)
+            company_payloads = {limit: orjson.dumps(company_records[:limit]) for limit in COMPANY_PAYLOAD_LIMITS}
+            # Reversed so the first record of a duplicated ticker wins
+            company_record_by_ticker = {record["ticker"]: record for record in reversed(company_records)}
+            # Companies without a name fall back to their ticker in get_company_name
+            names = text_column(company_info, 'company_name')
+            tickers = company_info['ticker'].to_numpy(dtype=object)
+            ticker_to_name = {ticker: name for ticker, name in zip(tickers[::-1], names[::-1]) if name}
             print(f"Loaded company info: {len(company_info)} records")
             
     except Exception as e:
@@ -107,221 +462,175 @@ async def startup_event():
 async def root():
     return {"message": "Financial Data API", "version": "1.0.0"}
 
-@app.get("/api/indicators", response_model=List[EconomicIndicator])
-async def search_indicators(q: str = Query(..., description="Search query")):
+def find_indicators(q: str) -> List[Dict[str, Any]]:
     """Search economic indicators from IMF and World Bank data"""
     results = []
     
+    # Search IMF data
+    if imf_fields is not None:
+        positions = find_rows(imf_search, q, 10)
+        results.extend(indicator_records(imf_fields, positions, "IMF", ["macro", "economic"]))
+    
+    # Search World Bank data
+    if wb_fields is not None:
+        positions = find_rows(wb_search, q, 10)
+        results.extend(indicator_records(wb_fields, positions, "World Bank", ["economic", "development"]))
+    
+    return results[:20]  # Limit to 20 results
+
+def find_companies(q: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """Search companies by name or ticker"""
+    if company_info is None:
+        return []
+    
+    company_matches = company_info.iloc[find_rows(company_search, q, limit)]
+    return [
+        {
+            "ticker": row.ticker,
+            "name": getattr(row, 'company_name', ''),
+            "sector": getattr(row, 'sector', ''),
+            "industry": getattr(row, 'industry', '')
+        }
+        for row in company_matches.itertuples(index=False)
+    ]
+
+def find_symbols(q: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """Search market symbols by ticker, prefix matches first"""
+    if not market_by_ticker:
+        return []
+    
+    ql = q.lower()
+    symbol_matches = []
+    
+    # Prefix matches are contiguous in the sorted ticker list
+    i = bisect_left(market_tickers_lc, ql)
+    while i < len(market_tickers_lc) and len(symbol_matches) < limit and market_tickers_lc[i].startswith(ql):
+        symbol_matches.append(market_tickers[i])
+        i += 1
+    
+    # Fill up with tickers containing the query elsewhere
+    if len(symbol_matches) < limit:
+        for ticker, ticker_lc in zip(market_tickers, market_tickers_lc):
+            if ql in ticker_lc and not ticker_lc.startswith(ql):
+                symbol_matches.append(ticker)
+                if len(symbol_matches) == limit:
+                    break
+    
+    return [{"symbol": symbol, "name": get_company_name(symbol)} for symbol in symbol_matches]
+
+@app.get("/api/indicators", responses={200: {"model": List[EconomicIndicator]}})
+def search_indicators(q: str = Query(..., description="Search query")):
+    """Search economic indicators from IMF and World Bank data"""
     try:
-        # Search IMF data
-        if imf_data is not None:
-            imf_matches = imf_data[
-                imf_data['indicator_name_fr'].str.contains(q, case=False, na=False) |
-                imf_data['country'].str.contains(q, case=False, na=False)
-            ].head(10)
-            
-            for _, row in imf_matches.iterrows():
-                results.append(EconomicIndicator(
-                    id=str(row['id']),
-                    title=row['indicator_name_fr'],
-                    description=row.get('description', '') or '',
-                    source="IMF",
-                    category=["macro", "economic"],
-                    country=row.get('country', ''),
-                    value=str(row.get('value', 'N/A')),
-                    lastUpdate=row.get('last_updated', ''),
-                    frequency="Annual",
-                    year=str(row.get('year', '')),
-                    unit=""
-                ))
-        
-        # Search World Bank data
-        if wb_data is not None:
-            wb_matches = wb_data[
-                wb_data['indicator_name_fr'].str.contains(q, case=False, na=False) |
-                wb_data['country_name'].str.contains(q, case=False, na=False)
-            ].head(10)
-            
-            for _, row in wb_matches.iterrows():
-                results.append(EconomicIndicator(
-                    id=str(row['id']),
-                    title=row['indicator_name_fr'],
-                    description=row.get('indicator_name', '') or '',
-                    source="World Bank",
-                    category=["economic", "development"],
-                    country=row.get('country_name', ''),
-                    value=str(row.get('value', 'N/A')),
-                    lastUpdate=row.get('last_updated', ''),
-                    frequency="Annual",
-                    year=str(row.get('year', '')),
-                    unit=row.get('unit', '') or ''
-                ))
-        
+        return find_indicators(q)
     except Exception as e:
         print(f"Error searching indicators: {e}")
         raise HTTPException(status_code=500, detail="Error searching indicators")
-    
-    return results[:20]  # Limit to 20 results
 
 @app.get("/api/financial/{symbol}", response_model=FinancialData)
-async def get_financial_data(symbol: str):
+def get_financial_data(symbol: str):
     """Get financial data for a specific symbol"""
-    if market_data is None:
+    if not market_by_ticker:
         raise HTTPException(status_code=404, detail="Market data not available")
     
     try:
         # Get latest data for symbol
-        symbol_data = market_data[market_data['ticker'] == symbol.upper()]
-        if symbol_data.empty:
+        symbol_data = market_by_ticker.get(symbol.upper())
+        if symbol_data is None:
             raise HTTPException(status_code=404, detail=f"Symbol {symbol} not found")
         
-        latest = symbol_data.iloc[-1]
+        change = float(symbol_data.change[-1]) if symbol_data.change is not None else 0.0
+        market_cap = symbol_data.market_cap[-1] if symbol_data.market_cap is not None else None
         
         return FinancialData(
             symbol=symbol.upper(),
             name=get_company_name(symbol.upper()),
-            price=float(latest['close_price']),
-            change=float(latest.get('rendement', 0)),
-            changePercent=float(latest.get('rendement', 0)),
-            volume=float(latest.get('volume', 0)),
-            marketCap=float(latest.get('market_cap', 0)) if pd.notna(latest.get('market_cap')) else None
+            price=float(symbol_data.close[-1]),
+            change=change,
+            changePercent=change,
+            volume=float(symbol_data.volume[-1]),
+            marketCap=float(market_cap) if pd.notna(market_cap) else None
         )
     
     except Exception as e:
         print(f"Error getting financial data: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving financial data")
 
-@app.get("/api/chart/{symbol}", response_model=List[ChartData])
-async def get_chart_data(symbol: str, period: str = Query("1M", description="Time period")):
+@app.get("/api/chart/{symbol}", responses={200: {"model": List[ChartData]}})
+def get_chart_data(symbol: str, period: str = Query("1M", description="Time period")):
     """Get chart data for a specific symbol"""
-    if market_data is None:
+    if not market_by_ticker:
         raise HTTPException(status_code=404, detail="Market data not available")
     
     try:
-        symbol_data = market_data[market_data['ticker'] == symbol.upper()]
-        if symbol_data.empty:
+        if symbol.upper() not in market_by_ticker:
             raise HTTPException(status_code=404, detail=f"Symbol {symbol} not found")
         
-        # Sort by timestamp and limit based on period
-        symbol_data = symbol_data.sort_values('timestamp')
-        
-        # Simple period filtering (you can enhance this)
-        if period == "1W":
-            symbol_data = symbol_data.tail(7)
-        elif period == "1M":
-            symbol_data = symbol_data.tail(30)
-        elif period == "3M":
-            symbol_data = symbol_data.tail(90)
-        elif period == "1Y":
-            symbol_data = symbol_data.tail(365)
-        
-        chart_data = []
-        for _, row in symbol_data.iterrows():
-            chart_data.append(ChartData(
-                timestamp=row['timestamp'],
-                open=float(row['open_price']),
-                high=float(row['high_price']),
-                low=float(row['low_price']),
-                close=float(row['close_price']),
-                volume=float(row['volume'])
-            ))
-        
-        return chart_data
+        content = chart_payload(symbol.upper(), CHART_PERIODS.get(period))
+        return Response(content=content, media_type="application/json")
     
     except Exception as e:
         print(f"Error getting chart data: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving chart data")
 
-@app.get("/api/companies", response_model=List[CompanyInfo])
-async def get_companies(limit: int = Query(10, description="Number of companies to return")):
+@lru_cache(maxsize=4096)
+def chart_payload(symbol: str, rows: Optional[int]) -> bytes:
+    """Serialized chart data for a symbol, built once per (symbol, period)"""
+    arrays = market_by_ticker[symbol]
+    window = slice(-rows, None) if rows is not None else slice(None)
+    
+    # Slicing the column arrays only creates views
+    chart_data = [
+        {"timestamp": t, "open": op, "high": hi, "low": lo, "close": cl, "volume": vol}
+        for t, op, hi, lo, cl, vol in zip(
+            arrays.timestamp[window], arrays.open[window], arrays.high[window],
+            arrays.low[window], arrays.close[window], arrays.volume[window]
+        )
+    ]
+    
+    return orjson.dumps(chart_data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+@app.get("/api/companies", responses={200: {"model": List[CompanyInfo]}})
+def get_companies(limit: int = Query(10, description="Number of companies to return")):
     """Get list of companies"""
     if company_info is None:
         raise HTTPException(status_code=404, detail="Company data not available")
     
     try:
-        companies = []
-        for _, row in company_info.head(limit).iterrows():
-            companies.append(CompanyInfo(
-                ticker=row['ticker'],
-                company_name=row.get('company_name', ''),
-                long_business_summary=row.get('long_business_summary', ''),
-                website=row.get('website', ''),
-                industry=row.get('industry', ''),
-                sector=row.get('sector', ''),
-                country=row.get('country', ''),
-                city=row.get('city', ''),
-                employees=int(row['full_time_employees']) if pd.notna(row.get('full_time_employees')) else None
-            ))
-        
-        return companies
+        content = company_payloads.get(limit)
+        if content is None:
+            content = orjson.dumps(company_records[:limit])
+        return Response(content=content, media_type="application/json")
     
     except Exception as e:
         print(f"Error getting companies: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving companies")
 
 @app.get("/api/company/{ticker}", response_model=CompanyInfo)
-async def get_company(ticker: str):
+def get_company(ticker: str):
     """Get specific company information"""
     if company_info is None:
         raise HTTPException(status_code=404, detail="Company data not available")
     
     try:
-        company_data = company_info[company_info['ticker'] == ticker.upper()]
-        if company_data.empty:
+        record = company_record_by_ticker.get(ticker.upper())
+        if record is None:
             raise HTTPException(status_code=404, detail=f"Company {ticker} not found")
         
-        row = company_data.iloc[0]
-        return CompanyInfo(
-            ticker=row['ticker'],
-            company_name=row.get('company_name', ''),
-            long_business_summary=row.get('long_business_summary', ''),
-            website=row.get('website', ''),
-            industry=row.get('industry', ''),
-            sector=row.get('sector', ''),
-            country=row.get('country', ''),
-            city=row.get('city', ''),
-            employees=int(row['full_time_employees']) if pd.notna(row.get('full_time_employees')) else None
-        )
+        return CompanyInfo(**record)
     
     except Exception as e:
         print(f"Error getting company: {e}")
         raise HTTPException(status_code=500, detail="Error retrieving company")
 
 @app.get("/api/economic/{indicator_id}")
-async def get_economic_indicator(indicator_id: str):
+def get_economic_indicator(indicator_id: str):
     """Get specific economic indicator data"""
     try:
-        # Search in IMF data
-        if imf_data is not None:
-            imf_result = imf_data[imf_data['id'] == int(indicator_id)]
-            if not imf_result.empty:
-                row = imf_result.iloc[0]
-                return {
-                    "id": str(row['id']),
-                    "title": row['indicator_name_fr'],
-                    "description": row.get('description', ''),
-                    "source": "IMF",
-                    "value": row.get('value', 'N/A'),
-                    "country": row.get('country', ''),
-                    "year": row.get('year', ''),
-                    "lastUpdate": row.get('last_updated', '')
-                }
-        
-        # Search in World Bank data
-        if wb_data is not None:
-            wb_result = wb_data[wb_data['id'] == int(indicator_id)]
-            if not wb_result.empty:
-                row = wb_result.iloc[0]
-                return {
-                    "id": str(row['id']),
-                    "title": row['indicator_name_fr'],
-                    "description": row.get('indicator_name', ''),
-                    "source": "World Bank",
-                    "value": row.get('value', 'N/A'),
-                    "country": row.get('country_name', ''),
-                    "year": row.get('year', ''),
-                    "lastUpdate": row.get('last_updated', '')
-                }
+        entry = indicator_by_id.get(int(indicator_id))
+        if entry is not None:
+            source, position = entry
+            return indicator_detail(imf_fields if source == "IMF" else wb_fields, position, source)
         
         raise HTTPException(status_code=404, detail="Indicator not found")
         
@@ -331,11 +640,7 @@ async def get_economic_indicator(indicator_id: str):
 
 def get_company_name(ticker: str) -> Optional[str]:
     """Helper function to get company name from ticker"""
-    if company_info is not None:
-        company_data = company_info[company_info['ticker'] == ticker]
-        if not company_data.empty:
-            return company_data.iloc[0].get('company_name', ticker)
-    return ticker
+    return ticker_to_name.get(ticker, ticker)
 
 @app.get("/api/search")
 async def search_all(q: str = Query(..., description="Search query")):
@@ -346,43 +651,31 @@ async def search_all(q: str = Query(..., description="Search query")):
         "symbols": []
     }
     
-    try:
-        # Search indicators
-        indicators_response = await search_indicators(q)
-        results["indicators"] = [indicator.dict() for indicator in indicators_response[:5]]
-        
-        # Search companies
-        if company_info is not None:
-            company_matches = company_info[
-                company_info['company_name'].str.contains(q, case=False, na=False) |
-                company_info['ticker'].str.contains(q, case=False, na=False)
-            ].head(5)
-            
-            for _, row in company_matches.iterrows():
-                results["companies"].append({
-                    "ticker": row['ticker'],
-                    "name": row.get('company_name', ''),
-                    "sector": row.get('sector', ''),
-                    "industry": row.get('industry', '')
-                })
-        
-        # Search market symbols
-        if market_data is not None:
-            symbol_matches = market_data[
-                market_data['ticker'].str.contains(q, case=False, na=False)
-            ]['ticker'].unique()[:5]
-            
-            for symbol in symbol_matches:
-                results["symbols"].append({
-                    "symbol": symbol,
-                    "name": get_company_name(symbol)
-                })
-        
-    except Exception as e:
-        print(f"Error in global search: {e}")
+    # The three searches use independent tables, so run them side by side in the threadpool
+    indicators, companies, symbols = await asyncio.gather(
+        asyncio.to_thread(find_indicators, q),
+        asyncio.to_thread(find_companies, q),
+        asyncio.to_thread(find_symbols, q),
+        return_exceptions=True
+    )
+    
+    for key, found in (("indicators", indicators), ("companies", companies), ("symbols", symbols)):
+        if isinstance(found, Exception):
+            print(f"Error in global search: {found}")
+        else:
+            results[key] = found[:5]
     
     return results
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Production-style run without access log or Server header. Set WEB_CONCURRENCY to run
+    # several workers: only converted market arrays are shared, every worker loads the rest itself
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        access_log=False,
+        server_header=False
+    )
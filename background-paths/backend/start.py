@@ -9,12 +9,13 @@ if __name__ == "__main__":
     # Change to the root directory to access CSV files
     os.chdir("..")
     
-    # Run the FastAPI server
+    # Run the FastAPI server; uvicorn picks uvloop and httptools when they are installed
     uvicorn.run(
         "backend.main:app",
         host="0.0.0.0",
         port=8000,
         reload=True,
         reload_dirs=["backend"],
+        server_header=False,
         log_level="info"
     )